@@ -9,8 +9,22 @@
 
 """Helpers to validate form datum."""
 
+import sys
+import keyword
+import itertools
+
 from nagare import var
 
+_marker = object()
+_NO_INPUT = (_marker, None)
+_SCALAR_TYPES = (str, bytes, int, float)
+_SPECIALIZED_EDITORS = {}  # (Editor class, properties names) -> specialized Editor class
+
+
+def _intern(name):
+    # ``sys.intern()`` only accepts the exact ``str`` type
+    return sys.intern(name) if name.__class__ is str else name
+
 
 class Property(var.Var):
     """An editor property.
@@ -38,6 +52,8 @@ class Property(var.Var):
 
         self.value = v
         self.error = None
+        self._skip_unchanged = False
+        self._last_input = _NO_INPUT  # Last input successfully validated, with the validator version
 
     @staticmethod
     def _validate(input):
@@ -51,7 +67,7 @@ class Property(var.Var):
         """
         return input
 
-    def validate(self, f):
+    def validate(self, f, skip_unchanged=False):
         """Set the validating function.
 
         In:
@@ -59,11 +75,17 @@ class Property(var.Var):
             validate. Raise the exception ``ValueError`` is the value is
             invalid. Return the value to be set (i.e a validation function
             can do conversions too)
+          - ``skip_unchanged`` -- don't validate again the last valid input.
+            Only to be used if the validation only depends on the input. A
+            deferred validator is always called again after its calls chain
+            has been modified
 
         Return:
           - ``self``
         """
         self._validate = f
+        self._skip_unchanged = skip_unchanged
+        self._last_input = _NO_INPUT
         return self
 
     def set(self, input):
@@ -75,16 +97,29 @@ class Property(var.Var):
         In:
           - ``input`` -- the input string or ``cgi.FieldStorage`` object
         """
-        if not hasattr(input, 'file'):
+        if isinstance(input, _SCALAR_TYPES) or not hasattr(input, 'file'):
             super(Property, self).set(input)
 
+        validator = self._validate
+
+        if self._skip_unchanged:
+            version = getattr(validator, '_version', None)
+            last_input, last_version = self._last_input
+            if (input.__class__ is last_input.__class__) and (input == last_input) and (version == last_version):
+                return
+
+            self._last_input = _NO_INPUT
+
         try:
-            self.value = self._validate(input)  # Call the validating function
-            if callable(self.value):
-                self.value = self.value()
+            value = validator(input)  # Call the validating function
+            self.value = value() if callable(value) else value
             self.error = None
         except ValueError as data:
             self.error = data.args[0]
+            return
+
+        if self._skip_unchanged and isinstance(input, _SCALAR_TYPES):
+            self._last_input = (input, version)
 
 
 class Editor(object):
@@ -108,13 +143,98 @@ class Editor(object):
             target object, then to write into
         """
         self.target = target
-        self.properties_to_commit = properties_to_create
+        # Interned names are compared by identity in the attributes lookups
+        self.properties_to_commit = properties_to_create = tuple(map(_intern, properties_to_create))
 
         for name in properties_to_create:
             # Create a property with the same name and value than the attribute
             # of the target object
             self.create_property(name, self.read_value(target, name))
 
+    @classmethod
+    def specialize(cls, names):
+        """Create a sub-class with ``__init__`` and ``commit`` unrolled for a fixed set of properties.
+
+        The ``read_value()``, ``write_value()`` and ``create_property()`` hooks
+        of ``cls`` are called only if they are overridden. A class overriding
+        ``__init__()``, ``commit()`` or ``is_validated()`` can't be specialized.
+
+        In:
+          - ``names`` -- names of the properties to create, then to commit
+
+        Return:
+          - the ``Editor`` sub-class, created once for a given class and names
+        """
+        for method in ('__init__', 'commit', 'is_validated'):
+            if getattr(cls, method) is not getattr(Editor, method):
+                raise TypeError('%s overrides %s(), it can not be specialized' % (cls.__name__, method))
+
+        names = tuple(map(_intern, names))
+        specialized = _SPECIALIZED_EDITORS.get((cls, names))
+        if specialized is not None:
+            return specialized
+
+        for name in names:
+            if not name.isidentifier() or keyword.iskeyword(name):
+                raise ValueError('Invalid property name %r' % name)
+
+        direct_read = cls.read_value is Editor.read_value
+        direct_write = cls.write_value is Editor.write_value
+        direct_create = cls.create_property is Editor.create_property
+
+        src = [
+            'def __init__(self, target, properties_to_create=None):',
+            '    if (properties_to_create is not None) and (tuple(properties_to_create) != _names):',
+            '        return super(_cls, self).__init__(target, properties_to_create)',
+            '    self.target = target',
+            '    self.properties_to_commit = _names',
+            '    factory = self.property_factory',
+        ]
+        for name in names:
+            value = ('target.%s' if direct_read else 'self.read_value(target, %r)') % name
+            if direct_create:
+                src.append('    self.%s = factory(%s)' % (name, value))
+            else:
+                src.append('    self.create_property(%r, %s)' % (name, value))
+
+        src += [
+            '',
+            'def commit(self, properties_to_commit=None, properties_to_validate=(), validation=True):',
+            '    names = self.properties_to_commit if properties_to_commit is None else tuple(properties_to_commit)',
+            '    if names != _names:',
+            '        return super(_cls, self).commit(names, properties_to_validate, validation)',
+            '    if validation:',
+        ]
+        src.extend('        if self.%s.error is not None: return False' % name for name in names)
+        src += [
+            '        if properties_to_validate and not self.is_validated(properties_to_validate): return False',
+            '    target = self.target',
+        ]
+        for name in names:
+            if direct_write:
+                src.append('    target.%s = self.%s.value' % (name, name))
+            else:
+                src.append('    self.write_value(target, %r, self.%s.value)' % (name, name))
+        src.append('    return True')
+
+        # The specialized class can't be found by name: its instances are unpickled
+        # by specializing the base class again
+        src += [
+            '',
+            'def __reduce__(self):',
+            '    return _new_specialized_editor, (_base, _names), self.__dict__',
+        ]
+
+        ns = {'_names': names, '_base': cls, '_new_specialized_editor': _new_specialized_editor}
+        exec(compile('\n'.join(src), '<editor %s>' % cls.__name__, 'exec'), ns)  # noqa: S102
+
+        methods = {name: ns[name] for name in ('__init__', 'commit', '__reduce__')}
+        methods['__module__'] = cls.__module__
+        ns['_cls'] = specialized = type(cls)(cls.__name__, (cls,), methods)
+        _SPECIALIZED_EDITORS[cls, names] = specialized
+
+        return specialized
+
     @staticmethod
     def read_value(target, name):
         return getattr(target, name)
@@ -130,12 +250,17 @@ class Editor(object):
         """Check the validity of a set of properties.
 
         In:
-          - ``properties_to_validate`` -- name of the properties to validate
+          - ``properties_to_validate`` -- iterable of the names of the properties to validate
 
         Return:
           - a boolean
         """
-        return all(getattr(self, name).error is None for name in properties_to_validate)
+        # A plain loop avoids the generator frame of all()
+        for name in properties_to_validate:  # noqa: SIM110
+            if getattr(self, name).error is not None:
+                return False
+
+        return True
 
     def commit(self, properties_to_commit=None, properties_to_validate=(), validation=True):
         """Write back the value of the property to the target object, only if they are all valid.
@@ -150,9 +275,16 @@ class Editor(object):
         """
         properties_to_commit = self.properties_to_commit if properties_to_commit is None else properties_to_commit
 
-        validated = (self.is_validated(set(properties_to_commit) | set(properties_to_validate))) if validation else True
+        validated = (not validation) or self.is_validated(itertools.chain(properties_to_commit, properties_to_validate))
         if validated:
+            target = self.target
+            write_value = self.write_value
             for name in properties_to_commit:
-                self.write_value(self.target, name, getattr(self, name).value)
+                write_value(target, name, getattr(self, name).value)
 
         return validated
+
+
+def _new_specialized_editor(cls, names):
+    specialized = cls.specialize(names)
+    return specialized.__new__(specialized)
@@ -13,15 +13,88 @@ Suitable to be the validating functions of ``editor.property`` objects
 """
 
 import re
-import sys
 import functools
 
 from nagare import i18n
 
 _L = functools.partial(i18n._L, domain='nagare')
 
+# Default error messages
+_MSG_STRING = _L('Input must be a string')
+_MSG_INT = _L('Must be an integer')
+_MSG_LT = _L('Must be lesser than %(max)d')
+_MSG_LE = _L('Must be lesser or equal than %(max)d')
+_MSG_GT = _L('Must be greater than %(min)d')
+_MSG_GE = _L('Must be greater or equal than %(min)d')
+_MSG_NOT_EMPTY = _L("Can't be empty")
+_MSG_MATCH = _L('Incorrect format')
+_MSG_SHORTER_THAN = _L('Length must be shorter than %(max)d characters')
+_MSG_SHORTER_OR_EQUAL_THAN = _L('Length must be shorter or equal than %(max)d characters')
+_MSG_LENGTH_EQUAL = _L('Length must be %(len)d characters')
+_MSG_LONGER_THAN = _L('Length must be longer than %(min)d characters')
+_MSG_LONGER_OR_EQUAL_THAN = _L('Length must be longer or equal than %(min)d characters')
+_MSG_CHARSET = _L('Some characters are not allowed')
+_MSG_ISALNUM = _L('Some characters are not alphanumeric')
+_MSG_ISALPHA = _L('Some characters are not alphabetic')
+_MSG_ISDIGIT = _L('Some characters are not digits')
+_MSG_ISLOWER = _L('Some characters are not lowercase')
+_MSG_ISUPPER = _L('Some characters are not uppercase')
+_MSG_ISSPACE = _L('Some characters are not whitespace')
+
 _marker = object()
 
+# ASCII charsets for ``StringValidator.matches_charset()``
+ASCII_ALPHA = bytes(i for i in range(128) if chr(i).isalpha())
+ASCII_DIGITS = bytes(i for i in range(128) if chr(i).isdigit())
+ASCII_ALNUM = ASCII_ALPHA + ASCII_DIGITS
+
+# Stripping function, indexed by ``(strip << 2) | (rstrip << 1) | lstrip``
+_STRIP_FUNCS = (None, str.lstrip, str.rstrip) + (str.strip,) * 5
+
+
+@functools.lru_cache(maxsize=512)
+def _compile(pattern, flags=0):
+    return re.compile(pattern, flags)
+
+
+class LazyValidationError(ValueError):
+    """A validation error with its message only formatted when read.
+
+    The formatting is saved only by the callers catching the error without
+    reading its message: ``Property.set()`` and ``try_call()`` always read it.
+    """
+
+    def __init__(self, msg, params):
+        """Initialisation.
+
+        In:
+          - ``msg`` -- the message template
+          - ``params`` -- the dictionary of parameters to format the message with
+        """
+        super(LazyValidationError, self).__init__(msg, params)
+        self._args = None
+
+    @property
+    def args(self):
+        args = self._args
+        if args is None:
+            msg, params = super(LazyValidationError, self).args
+            self._args = args = (msg % params,)
+
+        return args
+
+    @args.setter
+    def args(self, args):
+        self._args = tuple(args)
+
+    def __str__(self):
+        args = self.args
+        return str(args[0]) if len(args) == 1 else (str(args) if args else '')
+
+    def __repr__(self):
+        args = self.args
+        return '%s(%r)' % (type(self).__name__, args[0]) if len(args) == 1 else type(self).__name__ + repr(args)
+
 
 class DualCallable(type):
     """A hackish metaclass to allow both direct and deferred calls of methods.
@@ -33,69 +106,147 @@ class DualCallable(type):
       - New validation with lazy calls: valid = IntValidator().greater_than(10)
     """
 
-    def __new__(cls, name, bases, ns):
-        """Class Initialization.
-
-        Create a dual class too
-
-        In:
-          - ``name`` -- name of the class to create
-          - ``bases`` -- base classes of the class to create
-          - ``ns`` -- namespace of the class to create
+    @property
+    def _dual(cls):
+        """The dual class, created on first access.
 
         Return:
-          - a new class
+          - the dual class
         """
-        validator = super().__new__(cls, name, bases, ns)
-
-        if name != 'ValidatorBase':
-            dual = super().__new__(
-                cls,
-                name + 'Dual',
-                tuple(getattr(sys.modules[base.__module__], base.__name__ + 'Dual') for base in bases),
-                {
-                    method_name: (
-                        lambda method: functools.wraps(method)(
-                            lambda self, *args, **kw: self._defer_call(method, args, kw)
-                        )
-                    )(method)
-                    for method_name, method in ns.items()
-                    if callable(method) and not method_name.startswith('_')
-                },
+        dual = cls.__dict__.get('_dual_class')
+        if dual is None:
+            dual = type(
+                cls.__name__ + 'Dual',
+                tuple(base._dual for base in cls.__bases__ if isinstance(base, DualCallable)),
+                {'__module__': cls.__module__, '__slots__': (), '_dual': cls},
             )
+            cls._dual_class = dual
 
-            dual.__module__ = validator.__module__
-            dual._dual = validator
-            validator._dual = dual
+        return dual
 
-            setattr(sys.modules[validator.__module__], name + 'Dual', dual)
 
-        return validator
+def _new_dual(cls):
+    return object.__new__(cls._dual)
 
 
 class ValidatorBaseDual:
-    _dual = None
+    __slots__ = ('init_args', 'init_kw', '_calls', '_run', '_version')
+    _dual = None  # Set to ``ValidatorBase`` below
 
     def __init__(self, *args, **kw):
         self.init_args = args
         self.init_kw = kw
         self._calls = []
+        self._run = None
+        self._version = 0  # Incremented each time the calls chain is modified
+
+    def __getstate__(self):
+        # The compiled calls chain is not serializable
+        return self.init_args, self.init_kw, self._calls, self._version
+
+    def __setstate__(self, state):
+        self.init_args, self.init_kw, self._calls, self._version = state
+        self._run = None
+
+    def __reduce__(self):
+        # The dual classes aren't attributes of their modules: rebuild through the validator class
+        return _new_dual, (self._dual,), self.__getstate__()
+
+    def _defer_call(self, method_name, *args, **kw):
+        self._calls.append((getattr(self._dual, method_name), args, kw))
+        self._run = None
+        self._version += 1
+        return self
+
+    def freeze(self):
+        """Compile the chain of deferred calls into a single function.
+
+        To be used when the validator is reused with a lot of values
+
+        Return:
+          - ``self``
+        """
+        src = ['def _run(validator):']
+        ns = {}
+        for i, (f, args, kw) in enumerate(self._calls):
+            ns['_f%d' % i] = f
+            params = ['validator']
+
+            if args:
+                ns['_a%d' % i] = args
+                params.append('*_a%d' % i)
+
+            if kw:
+                ns['_kw%d' % i] = kw
+                params.append('**_kw%d' % i)
+
+            src.append('    _f%d(%s)' % (i, ', '.join(params)))
+        src.append('    return validator()')
+
+        exec(compile('\n'.join(src), '<validator %s>' % self._dual.__name__, 'exec'), ns)  # noqa: S102
+        self._run = ns['_run']
+        self._version += 1
 
-    def _defer_call(self, method, args, kw):
-        self._calls.append((method, args, kw))
         return self
 
+    def __getattr__(self, name):
+        """Defer the calls to the public methods of the validator class.
+
+        In:
+          - ``name`` -- name of the method
+
+        Return:
+          - a method recording the call
+        """
+        if not name.startswith('_'):
+            for cls in self._dual.__mro__:
+                method = vars(cls).get(name)
+                if method is not None:
+                    if callable(method):
+                        # Memoize the deferring method on the dual class. The method is resolved
+                        # by name so sub-classes overriding it are still correctly deferred
+                        setattr(type(self), name, functools.partialmethod(ValidatorBaseDual._defer_call, name))
+                        return getattr(self, name)
+
+                    break
+
+        raise AttributeError('{!r} object has no attribute {!r}'.format(type(self).__name__, name))
+
     def __call__(self, value):
         validator = self._dual(value, *self.init_args, **self.init_kw)
+
+        run = self._run
+        if run is not None:
+            return run(validator)
+
         for f, args, kw in self._calls:
             f(validator, *args, **kw)
 
         return validator()
 
+    def try_call(self, value):
+        """Validate a value, without raising an exception.
+
+        Only a convenience: the validation is still done by ``__call__()``,
+        its ``ValueError`` being caught
+
+        In:
+          - ``value`` -- value to validate
+
+        Return:
+          - tuple (``True``, validated value) or (``False``, error message)
+        """
+        try:
+            return True, self(value)
+        except ValueError as e:
+            return False, e.args[0]
+
 
 class ValidatorBase(metaclass=DualCallable):
     """Base class for the validation objects."""
 
+    __slots__ = ('value',)
+
     def __new__(cls, v=_marker, *args, **kw):
         return super().__new__(cls) if v is not _marker else cls._dual(*args, **kw)
 
@@ -106,8 +257,14 @@ class ValidatorBase(metaclass=DualCallable):
         return self.value
 
 
+ValidatorBase._dual_class = ValidatorBaseDual
+ValidatorBaseDual._dual = ValidatorBase
+
+
 class Validator(ValidatorBase):
-    def __init__(self, v, strip=False, rstrip=False, lstrip=False, chars=None, msg=_L('Input must be a string')):
+    __slots__ = ()
+
+    def __init__(self, v, strip=False, rstrip=False, lstrip=False, chars=None, msg=None):
         """Initialization.
 
         This object only do conversions, possibly removing characters at the
@@ -121,16 +278,13 @@ class Validator(ValidatorBase):
           - ``chars`` -- list of characters to removed, spaces by default
         """
         if not isinstance(v, str):
+            if msg is None:
+                msg = _MSG_STRING
             raise ValueError(msg)
 
-        if strip:
-            v = v.strip(chars)
-
-        if rstrip:
-            v = v.rstrip(chars)
-
-        if lstrip:
-            v = v.lstrip(chars)
+        strip = _STRIP_FUNCS[(bool(strip) << 2) | (bool(rstrip) << 1) | bool(lstrip)]
+        if strip is not None:
+            v = strip(v, chars)
 
         super().__init__(v)
 
@@ -138,7 +292,9 @@ class Validator(ValidatorBase):
 class IntValidator(Validator):
     """Conversion and validation of integers."""
 
-    def __init__(self, v, base=10, msg=_L('Must be an integer'), *args, **kw):
+    __slots__ = ()
+
+    def __init__(self, v, base=10, msg=None, *args, **kw):
         """Initialisation.
 
         Check that the value is an integer
@@ -151,11 +307,92 @@ class IntValidator(Validator):
         try:
             self.value = int(self.value, base)
         except (ValueError, TypeError):
+            if msg is None:
+                msg = _MSG_INT
             raise ValueError(msg)
 
     to_int = Validator.__call__
 
-    def lesser_than(self, max, msg=_L('Must be lesser than %(max)d')):
+    @classmethod
+    def validate_batch(
+        cls,
+        values,
+        lesser_than=None,
+        lesser_or_equal_than=None,
+        greater_than=None,
+        greater_or_equal_than=None,
+        base=10,
+    ):
+        """Check a batch of values without creating a validator for each of them.
+
+        In:
+          - ``values`` -- iterable of values to validate. Strings are converted,
+            integers are checked as is and all the other values are invalid
+          - ``lesser_than``, ``lesser_or_equal_than``, ``greater_than``,
+            ``greater_or_equal_than`` -- optional limits, with the same meaning
+            than the methods of the same names
+          - ``base`` -- base for the conversion
+
+        Return:
+          - list of booleans, ``True`` if the value is a valid integer
+        """
+        mask = []
+        for value in values:
+            if value.__class__ is not int:
+                if not isinstance(value, str):
+                    mask.append(False)
+                    continue
+
+                try:
+                    value = int(value, base)
+                except ValueError:
+                    mask.append(False)
+                    continue
+
+            mask.append(
+                ((lesser_than is None) or (value < lesser_than))
+                and ((lesser_or_equal_than is None) or (value <= lesser_or_equal_than))
+                and ((greater_than is None) or (value > greater_than))
+                and ((greater_or_equal_than is None) or (value >= greater_or_equal_than))
+            )
+
+        return mask
+
+    def in_range(self, min=None, max=None, min_inclusive=True, max_inclusive=False, msg=None):
+        """Check, in one call, that the value is between two limits.
+
+        In:
+          - ``min`` -- the lower limit, if any
+          - ``max`` -- the upper limit, if any
+          - ``min_inclusive`` -- can the value be equal to the lower limit?
+          - ``max_inclusive`` -- can the value be equal to the upper limit?
+          - ``msg`` -- message to raise. By default, the message of the
+            comparison method for the limit not respected. Only the given
+            limits can be referenced into the message
+
+        Return:
+          - ``self``
+        """
+        value = self.value
+
+        if (min is not None) and not ((value >= min) if min_inclusive else (value > min)):
+            if msg is None:
+                msg = _MSG_GE if min_inclusive else _MSG_GT
+        elif (max is not None) and not ((value <= max) if max_inclusive else (value < max)):
+            if msg is None:
+                msg = _MSG_LE if max_inclusive else _MSG_LT
+        else:
+            return self
+
+        params = {'value': value}
+        if min is not None:
+            params['min'] = min
+        if max is not None:
+            params['max'] = max
+
+        raise LazyValidationError(msg, params)
+
+    def lesser_than(self, max, msg=None):
         """Check that the value is lesser than a limit.
 
         In:
@@ -168,9 +405,11 @@ class IntValidator(Validator):
         if self.value < max:
             return self
 
-        raise ValueError(msg % {'value': self.value, 'max': max})
+        if msg is None:
+            msg = _MSG_LT
+        raise LazyValidationError(msg, {'value': self.value, 'max': max})
 
-    def lesser_or_equal_than(self, max, msg=_L('Must be lesser or equal than %(max)d')):
+    def lesser_or_equal_than(self, max, msg=None):
         """Check that the value is lesser or equal than a limit.
 
         In:
@@ -183,9 +422,11 @@ class IntValidator(Validator):
         if self.value <= max:
             return self
 
-        raise ValueError(msg % {'value': self.value, 'max': max})
+        if msg is None:
+            msg = _MSG_LE
+        raise LazyValidationError(msg, {'value': self.value, 'max': max})
 
-    def greater_than(self, min, msg=_L('Must be greater than %(min)d')):
+    def greater_than(self, min, msg=None):
         """Check that the value is greater than a limit.
 
         In:
@@ -198,9 +439,11 @@ class IntValidator(Validator):
         if self.value > min:
             return self
 
-        raise ValueError(msg % {'value': self.value, 'min': min})
+        if msg is None:
+            msg = _MSG_GT
+        raise LazyValidationError(msg, {'value': self.value, 'min': min})
 
-    def greater_or_equal_than(self, min, msg=_L('Must be greater or equal than %(min)d')):
+    def greater_or_equal_than(self, min, msg=None):
         """Check that the value is greater or equal than a limit.
 
         In:
@@ -213,12 +456,16 @@ class IntValidator(Validator):
         if self.value >= min:
             return self
 
-        raise ValueError(msg % {'value': self.value, 'min': min})
+        if msg is None:
+            msg = _MSG_GE
+        raise LazyValidationError(msg, {'value': self.value, 'min': min})
 
 
 class StringValidator(Validator):
     """Conversion and validation of string."""
 
+    __slots__ = ()
+
     to_string = Validator.__call__
 
     def to_int(self, base=10):
@@ -233,7 +480,7 @@ class StringValidator(Validator):
         self.value = int(self.value, base=base)
         return self.value
 
-    def not_empty(self, msg=_L("Can't be empty")):
+    def not_empty(self, msg=None):
         """Check that the value is not empty.
 
         In:
@@ -245,24 +492,31 @@ class StringValidator(Validator):
         if len(self.value) != 0:
             return self
 
+        if msg is None:
+            msg = _MSG_NOT_EMPTY
         raise ValueError(msg)
 
-    def match(self, r, msg=_L('Incorrect format')):
+    def match(self, r, msg=None):
         """Check that the value respects a format given as a regexp.
 
         In:
-          - ``r`` -- the regexp
+          - ``r`` -- the regexp, as a string or a compiled pattern
           - ``msg`` -- message to raise
 
         Return:
           - ``self``
         """
-        if re.match(r, self.value):
+        if not isinstance(r, re.Pattern):
+            r = _compile(r)
+
+        if r.match(self.value):
             return self
 
-        raise ValueError(msg % {'value': self.value})
+        if msg is None:
+            msg = _MSG_MATCH
+        raise LazyValidationError(msg, {'value': self.value})
 
-    def shorter_than(self, max, msg=_L('Length must be shorter than %(max)d characters')):
+    def shorter_than(self, max, msg=None):
         """Check that the value is shorter than a limit.
 
         In:
@@ -275,9 +529,11 @@ class StringValidator(Validator):
         if len(self.value) < max:
             return self
 
-        raise ValueError(msg % {'value': self.value, 'max': max})
+        if msg is None:
+            msg = _MSG_SHORTER_THAN
+        raise LazyValidationError(msg, {'value': self.value, 'max': max})
 
-    def shorter_or_equal_than(self, max, msg=_L('Length must be shorter or equal than %(max)d characters')):
+    def shorter_or_equal_than(self, max, msg=None):
         """Check that the value is shorter or equal than a limit.
 
         In:
@@ -290,9 +546,11 @@ class StringValidator(Validator):
         if len(self.value) <= max:
             return self
 
-        raise ValueError(msg % {'value': self.value, 'max': max})
+        if msg is None:
+            msg = _MSG_SHORTER_OR_EQUAL_THAN
+        raise LazyValidationError(msg, {'value': self.value, 'max': max})
 
-    def length_equal(self, v, msg=_L('Length must be %(len)d characters')):
+    def length_equal(self, v, msg=None):
         """Check that the value has an exact length.
 
         In:
@@ -305,9 +563,11 @@ class StringValidator(Validator):
         if len(self.value) == v:
             return self
 
-        raise ValueError(msg % {'value': self.value, 'len': v})
+        if msg is None:
+            msg = _MSG_LENGTH_EQUAL
+        raise LazyValidationError(msg, {'value': self.value, 'len': v})
 
-    def longer_than(self, min, msg=_L('Length must be longer than %(min)d characters')):
+    def longer_than(self, min, msg=None):
         """Check that the value is longer than a limit.
 
         In:
@@ -320,9 +580,11 @@ class StringValidator(Validator):
         if len(self.value) > min:
             return self
 
-        raise ValueError(msg % {'value': self.value, 'min': min})
+        if msg is None:
+            msg = _MSG_LONGER_THAN
+        raise LazyValidationError(msg, {'value': self.value, 'min': min})
 
-    def longer_or_equal_than(self, min, msg=_L('Length must be longer or equal than %(min)d characters')):
+    def longer_or_equal_than(self, min, msg=None):
         """Check that the value is longer or equal than a limit.
 
         In:
@@ -335,45 +597,88 @@ class StringValidator(Validator):
         if len(self.value) >= min:
             return self
 
-        raise ValueError(msg % {'value': self.value, 'min': min})
+        if msg is None:
+            msg = _MSG_LONGER_OR_EQUAL_THAN
+        raise LazyValidationError(msg, {'value': self.value, 'min': min})
+
+    def matches_charset(self, allowed, msg=None):
+        """Check, in one pass, that all the characters of the value are in an ASCII charset.
 
-    def isalnum(self, msg=_L('Some characters are not alphanumeric')):
+        In:
+          - ``allowed`` -- the allowed characters, as ``bytes`` (i.e ``ASCII_ALNUM``)
+          - ``msg`` -- message to raise
+
+        Return:
+          - ``self``
+        """
+        try:
+            if not self.value.encode('ascii').translate(None, allowed):
+                return self
+        except UnicodeEncodeError:
+            pass
+
+        if msg is None:
+            msg = _MSG_CHARSET
+        raise LazyValidationError(msg, {'value': self.value})
+
+    def isalnum(self, msg=None):
         if self.value.isalnum():
             return self
 
-        raise ValueError(msg % {'value': self.value})
+        if msg is None:
+            msg = _MSG_ISALNUM
+        raise LazyValidationError(msg, {'value': self.value})
 
-    def isalpha(self, msg=_L('Some characters are not alphabetic')):
+    def isalpha(self, msg=None):
         if self.value.isalpha():
             return self
 
-        raise ValueError(msg % {'value': self.value})
+        if msg is None:
+            msg = _MSG_ISALPHA
+        raise LazyValidationError(msg, {'value': self.value})
 
-    def isdigit(self, msg=_L('Some characters are not digits')):
+    def isdigit(self, msg=None):
         if self.value.isdigit():
             return self
 
-        raise ValueError(msg % {'value': self.value})
+        if msg is None:
+            msg = _MSG_ISDIGIT
+        raise LazyValidationError(msg, {'value': self.value})
 
-    def islower(self, msg=_L('Some characters are not lowercase')):
+    def islower(self, msg=None):
         if self.value.islower():
             return self
 
-        raise ValueError(msg % {'value': self.value})
+        if msg is None:
+            msg = _MSG_ISLOWER
+        raise LazyValidationError(msg, {'value': self.value})
 
-    def isupper(self, msg=_L('Some characters are not uppercase')):
+    def isupper(self, msg=None):
         if self.value.isupper():
             return self
 
-        raise ValueError(msg % {'value': self.value})
+        if msg is None:
+            msg = _MSG_ISUPPER
+        raise LazyValidationError(msg, {'value': self.value})
 
-    def isspace(self, msg=_L('Some characters are not whitespace')):
+    def isspace(self, msg=None):
         if self.value.isspace():
             return self
 
-        raise ValueError(msg % {'value': self.value})
+        if msg is None:
+            msg = _MSG_ISSPACE
+        raise LazyValidationError(msg, {'value': self.value})
 
 
 # Aliases
 to_int = IntValidator
 to_string = StringValidator
+
+
+def __getattr__(name):
+    """Give access to the dual classes, as ``IntValidatorDual``."""
+    validator = globals().get(name[:-4]) if name.endswith('Dual') else None
+    if not isinstance(validator, DualCallable):
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    return validator._dual
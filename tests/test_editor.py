@@ -7,6 +7,9 @@
 # this distribution.
 # --
 
+import re
+import pickle
+
 from nagare import editor, validator
 
 
@@ -298,3 +301,344 @@ def test14():
     p = editor.Property().validate(check)
     p(15)
     assert (p.input == p() == 15) and (p.value is None) and (p.error == 'invalid')
+
+
+def test15():
+    """Validator - match with a compiled pattern"""
+    r = re.compile(r'^[a-d]+$')
+    assert validator.to_string('abab').match(r).to_string() == 'abab'
+
+    try:
+        validator.to_string('abrab').match(r)
+    except ValueError as e:
+        assert e.args[0] == 'Incorrect format'
+    else:
+        assert False
+
+
+def test16():
+    """Validator - deferred validation chain"""
+    p = editor.Property().validate(validator.to_int().greater_than(0).lesser_than(50))
+
+    p('4')
+    assert (p.input == p() == '4') and (p.value == 4) and (p.error is None)
+
+    p('1000')
+    assert (p.input == p() == '1000') and (p.value == 4) and (p.error == 'Must be lesser than 50')
+
+    assert isinstance(validator.to_int(), validator.IntValidatorDual)
+
+
+def test17():
+    """Validator - batch validation of integers"""
+    values = ['0', '1', '49', '50', 'abc', None]
+
+    assert validator.IntValidator.validate_batch(values) == [True, True, True, True, False, False]
+    assert validator.IntValidator.validate_batch(values, greater_than=0, lesser_than=50) == [
+        False,
+        True,
+        True,
+        False,
+        False,
+        False,
+    ]
+    assert validator.IntValidator.validate_batch(values, greater_or_equal_than=0, lesser_or_equal_than=50) == [
+        True,
+        True,
+        True,
+        True,
+        False,
+        False,
+    ]
+
+    assert validator.IntValidator.validate_batch([b'4', 4.0, True, 4, 60], lesser_than=50) == [
+        False,
+        False,
+        False,
+        True,
+        False,
+    ]
+
+
+def test18():
+    """Validator - ASCII charset"""
+    assert validator.to_string('abc123').matches_charset(validator.ASCII_ALNUM).to_string() == 'abc123'
+    assert validator.to_string('_ab_').matches_charset(validator.ASCII_ALPHA + b'_').to_string() == '_ab_'
+
+    for value in ('abc 123', 'abcé'):
+        try:
+            validator.to_string(value).matches_charset(validator.ASCII_ALNUM)
+        except ValueError as e:
+            assert e.args[0] == 'Some characters are not allowed'
+        else:
+            assert False
+
+
+def test19():
+    """Validator - stripping"""
+    assert validator.to_string('  abc  ').to_string() == '  abc  '
+    assert validator.to_string('  abc  ', strip=True).to_string() == 'abc'
+    assert validator.to_string('  abc  ', rstrip=True).to_string() == '  abc'
+    assert validator.to_string('  abc  ', lstrip=True).to_string() == 'abc  '
+    assert validator.to_string('  abc  ', rstrip=True, lstrip=True).to_string() == 'abc'
+    assert validator.to_string('xxabcxx', strip=True, chars='x').to_string() == 'abc'
+
+
+def test20():
+    """Validator - validation without exception"""
+    valid = validator.to_int().lesser_than(50)
+
+    assert valid.try_call('4') == (True, 4)
+    assert valid.try_call('1000') == (False, 'Must be lesser than 50')
+    assert valid.try_call('abc') == (False, 'Must be an integer')
+
+
+class CountingValidator(validator.IntValidator):
+    calls = []
+
+    def count(self):
+        self.calls.append(self.value)
+        return self
+
+
+def test21():
+    """Property - unchanged input not validated again"""
+    calls = CountingValidator.calls
+    valid = CountingValidator().count()
+
+    p = editor.Property().validate(valid, skip_unchanged=True)
+    p('4')
+    p('4')
+    assert (p.value == 4) and (p.error is None) and (calls == [4])
+
+    p('abc')
+    assert (p.value == 4) and (p.error == 'Must be an integer')
+    p('4')
+    assert (p.value == 4) and (p.error is None) and (calls == [4, 4])
+
+    p.validate(valid, skip_unchanged=True)
+    p('4')
+    assert calls == [4, 4, 4]
+
+    p.validate(valid)
+    p('4')
+    p('4')
+    assert calls == [4, 4, 4, 4, 4]
+
+
+def test22():
+    """Validator - range of integers"""
+    assert validator.to_int('0').in_range(0, 50).to_int() == 0
+    assert validator.to_int('50').in_range(0, 50, max_inclusive=True).to_int() == 50
+    assert validator.to_int('-10').in_range(max=50).to_int() == -10
+
+    for value, kw, error in (
+        ('0', {'min': 0, 'min_inclusive': False}, 'Must be greater than 0'),
+        ('-1', {'min': 0}, 'Must be greater or equal than 0'),
+        ('50', {'min': 0, 'max': 50}, 'Must be lesser than 50'),
+        ('51', {'max': 50, 'max_inclusive': True}, 'Must be lesser or equal than 50'),
+        ('51', {'min': 0, 'max': 50, 'msg': 'Not in [%(min)d, %(max)d['}, 'Not in [0, 50['),
+        ('5', {'max': 3, 'msg': '%(value)s is above %(max)d'}, '5 is above 3'),
+    ):
+        try:
+            validator.to_int(value).in_range(**kw)
+        except ValueError as e:
+            assert e.args[0] == error
+        else:
+            assert False
+
+    valid = validator.to_int().in_range(0, 50)
+    assert valid('4') == 4
+    assert valid.try_call('50') == (False, 'Must be lesser than 50')
+
+
+class MyIntValidator(validator.IntValidator):
+    def lesser_than(self, max, msg='Too big'):
+        return super().lesser_than(max, msg)
+
+
+def test23():
+    """Validator - deferred calls of overridden methods"""
+    assert validator.to_int().lesser_than(10).try_call('50') == (False, 'Must be lesser than 10')
+    assert MyIntValidator().lesser_than(10).try_call('50') == (False, 'Too big')
+
+
+def test24():
+    """Validator - frozen deferred validation chain"""
+    valid = validator.to_string(strip=True).not_empty().shorter_than(5, msg='Too long').freeze()
+
+    assert valid(' abc ') == 'abc'
+    assert valid.try_call('') == (False, "Can't be empty")
+    assert valid.try_call('abcdef') == (False, 'Too long')
+
+    valid.longer_than(1)
+    assert valid.try_call('a') == (False, 'Length must be longer than 1 characters')
+
+
+def test25():
+    """Form - specialized editor"""
+    SpecializedEditor = editor.Editor.specialize(('name', 'age'))
+
+    o = MyApp()
+    e = SpecializedEditor(o)
+    e.name('Bar')
+    e.age.validate(lambda v: validator.to_int(v).lesser_than(50).to_int())
+    e.age('100')
+
+    assert not e.commit()
+    assert o.name == 'Foo'
+
+    e.age('4')
+    assert e.commit()
+    assert o.name == 'Bar'
+    assert o.age == 4
+
+    e = SpecializedEditor(o, ('name',))
+    assert not hasattr(e, 'age')
+    assert e.commit()
+
+    assert editor.Editor.specialize(['name', 'age']) is SpecializedEditor
+
+    e = pickle.loads(pickle.dumps(SpecializedEditor(o)))
+    assert type(e) is SpecializedEditor
+    assert (e.target.name, e.age.value) == ('Bar', 4)
+
+
+def test26():
+    """Validator - lazy formatting of the error messages"""
+    try:
+        validator.IntValidator('100').lesser_than(50)
+    except ValueError as e:
+        assert isinstance(e, validator.LazyValidationError)
+        assert e.args == ('Must be lesser than 50',)
+        assert str(e) == 'Must be lesser than 50'
+        assert repr(e) == "LazyValidationError('Must be lesser than 50')"
+
+        e.args = ('Too big',)
+        assert (e.args, str(e)) == (('Too big',), 'Too big')
+
+    assert validator.to_int().greater_than(10).try_call('5') == (False, 'Must be greater than 10')
+
+    p = editor.Property().validate(lambda v: validator.to_string(v).shorter_than(2, msg='%(value)s is too long'))
+    p('abc')
+    assert p.error == 'abc is too long'
+
+
+def test27():
+    """Property - validating function and serialization"""
+    p = editor.Property(1)
+    assert p._validate('a') == 'a'
+
+    p._validate = int
+    p('42')
+    p.extra = 'extra'
+
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        p2 = pickle.loads(pickle.dumps(p, protocol))
+        assert (p2.input, p2.value, p2.error, p2.extra) == ('42', 42, None, 'extra')
+        assert p2._validate is int
+
+
+class UserName(validator.StringValidator):
+    taken = set()
+
+    def not_taken(self, msg='Already taken'):
+        if self.value in self.taken:
+            raise ValueError(msg)
+
+        return self
+
+
+def test28():
+    """Property - validation of an unchanged input"""
+    valid = validator.to_int()
+    p = editor.Property().validate(valid, skip_unchanged=True)
+    p('4')
+    assert (p.value, p.error) == (4, None)
+
+    valid.lesser_than(3)
+    p('4')
+    assert p.error == 'Must be lesser than 3'
+
+    p = editor.Property().validate(UserName().not_taken())
+    p('john')
+    assert p.error is None
+
+    UserName.taken.add('john')
+    p('john')
+    assert p.error == 'Already taken'
+
+
+class MyValidatingEditor(editor.Editor):
+    def is_validated(self, properties_to_validate):
+        return False
+
+
+class MyWritingEditor(editor.Editor):
+    @staticmethod
+    def write_value(target, name, value):
+        setattr(target, name, value * 2)
+
+
+def test29():
+    """Form - specialized sub-classes"""
+    o = MyApp()
+    e = MyWritingEditor.specialize(('name', 'age'))(o)
+    assert e.commit()
+    assert (o.name, o.age) == ('FooFoo', 10)
+
+    for cls in (MyEditor, MyStringEditor):
+        try:
+            cls.specialize(cls.fields)
+        except TypeError as e:
+            assert str(e) == '%s overrides __init__(), it can not be specialized' % cls.__name__
+        else:
+            assert False
+
+    try:
+        MyValidatingEditor.specialize(('name',))
+    except TypeError as e:
+        assert str(e) == 'MyValidatingEditor overrides is_validated(), it can not be specialized'
+    else:
+        assert False
+
+
+class Name(str):
+    pass
+
+
+def test30():
+    """Form - properties names of a ``str`` sub-class"""
+    o = MyApp()
+    e = editor.Editor(o, (Name('name'), Name('age')))
+    e.age(10)
+    assert e.commit()
+    assert o.age == 10
+
+
+def test31():
+    """Validator - serialization of a deferred validator of a sub-class"""
+    valid = pickle.loads(pickle.dumps(MyIntValidator().lesser_than(10)))
+    assert type(valid) is MyIntValidator._dual
+    assert valid.try_call('50') == (False, 'Too big')
+
+    p = pickle.loads(pickle.dumps(editor.Property().validate(MyIntValidator().lesser_than(10))))
+    p('50')
+    assert p.error == 'Too big'
+
+
+class StripProperty(editor.Property):
+    __slots__ = ('label',)
+
+    _validate = staticmethod(str.strip)
+
+
+def test32():
+    """Property - sub-class"""
+    p = StripProperty()
+    p.label = 'Name'
+    p('  a  ')
+    assert p.value == 'a'
+
+    p = pickle.loads(pickle.dumps(p))
+    assert (p.label, p.value) == ('Name', 'a')